@@ -1,68 +1,89 @@
 import streamlit as st
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
-import pandas as pd
-import json
+from spotipy.cache_handler import CacheFileHandler
+import orjson
+import bisect
+import csv
+import functools
+import io
 import os
+import tempfile
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+class MemoryCachedFileHandler(CacheFileHandler):
+    """Token cache that reads the token file once and keeps the token in memory"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.token_info = None
+    
+    def get_cached_token(self):
+        if self.token_info is None:
+            self.token_info = super().get_cached_token()
+        return self.token_info
+    
+    def save_token_to_cache(self, token_info):
+        # Only called when the token is refreshed, so writing through is cheap
+        self.token_info = token_info
+        super().save_token_to_cache(token_info)
+
+@st.cache_resource(show_spinner=False)
 def initialize_spotify():
     return spotipy.Spotify(auth_manager=SpotifyOAuth(
         client_id=st.secrets["spotify"]["client_id"],
         client_secret=st.secrets["spotify"]["client_secret"],
         redirect_uri=st.secrets["spotify"]["redirect_uri"],
-        scope='user-top-read user-library-read user-read-recently-played playlist-read-private'
+        scope='user-top-read user-library-read user-read-recently-played playlist-read-private',
+        cache_handler=MemoryCachedFileHandler()
     ))
 
+@st.cache_data(ttl=900, show_spinner="Fetching…", hash_funcs={spotipy.Spotify: id})
 def get_spotify_suggestions(sp):
     suggestions = []
     
-    try:
-        # Get top tracks with time range info
-        print("Fetching top tracks...")
-        top_tracks = sp.current_user_top_tracks(limit=50, time_range='long_term')['items']
-        
-        # Get recently played tracks with play counts
-        print("Fetching recent tracks...")
-        recent_tracks = sp.current_user_recently_played(limit=50)['items']
-        
-        # Get play count for last year
-        now = int(time.time() * 1000)  # Current time in milliseconds
-        year_ago = now - (365 * 24 * 60 * 60 * 1000)  # 365 days ago in milliseconds
-        
-        # Count plays in the last year from recent plays
-        play_counts = {}
-        for item in recent_tracks:
-            track_id = item['track']['id']
-            played_at = int(datetime.strptime(item['played_at'], '%Y-%m-%dT%H:%M:%S.%fZ').timestamp() * 1000)
-            if played_at > year_ago:
-                play_counts[track_id] = play_counts.get(track_id, 0) + 1
-
-        # Combine and deduplicate suggestions
-        seen_ids = set()
-        
-        for track in top_tracks:
-            if track['id'] not in seen_ids:
-                image_url = track['album']['images'][0]['url'] if track['album']['images'] else None
-                release_year = track['album']['release_date'][:4]  # Get year from release date
-                suggestions.append({
-                    'id': track['id'],
-                    'name': track['name'],
-                    'artist': track['artists'][0]['name'],
-                    'full_name': f"{track['name']} - {track['artists'][0]['name']}",
-                    'image_url': image_url,
-                    'release_year': release_year,
-                    'play_count': play_counts.get(track['id'], 0)
-                })
-                seen_ids.add(track['id'])
-        
-        return suggestions
-        
-    except Exception as e:
-        print(f"Error getting suggestions: {str(e)}")
-        return []
+    # Get top tracks with time range info and recently played tracks with
+    # play counts; both requests are independent, so run them concurrently
+    print("Fetching top and recent tracks...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        top_future = executor.submit(sp.current_user_top_tracks, limit=50, time_range='long_term')
+        recent_future = executor.submit(sp.current_user_recently_played, limit=50)
+        top_tracks = top_future.result()['items']
+        recent_tracks = recent_future.result()['items']
+    
+    # Get play count for last year
+    year_ago = time.time() - 365 * 24 * 60 * 60  # 365 days ago in seconds
+    
+    # Count plays in the last year from recent plays
+    play_counts = Counter(
+        item['track']['id'] for item in recent_tracks
+        if datetime.fromisoformat(item['played_at'].rstrip('Z')).timestamp() > year_ago
+    )
 
+    # Combine and deduplicate suggestions
+    seen_ids = set()
+    
+    for track in top_tracks:
+        if track['id'] not in seen_ids:
+            image_url = track['album']['images'][0]['url'] if track['album']['images'] else None
+            release_year = track['album']['release_date'][:4]  # Get year from release date
+            suggestions.append({
+                'id': track['id'],
+                'name': track['name'],
+                'artist': track['artists'][0]['name'],
+                'full_name': f"{track['name']} - {track['artists'][0]['name']}",
+                'image_url': image_url,
+                'release_year': release_year,
+                'play_count': play_counts.get(track['id'], 0)
+            })
+            seen_ids.add(track['id'])
+    
+    return suggestions
+
+@st.cache_data(ttl=3600, max_entries=512, hash_funcs={spotipy.Spotify: lambda _: None})
 def search_spotify(sp, query):
     if not query:
         return []
@@ -77,24 +98,26 @@ def search_spotify(sp, query):
         'release_year': track['album']['release_date'][:4]  # Get year from release date
     } for track in results['tracks']['items']]
 
-def display_song(song, rank=None):
-    """Display song information with image inline and additional info"""
-    spotify_url = f"https://open.spotify.com/track/{song['id']}"
+@functools.lru_cache(maxsize=4096)
+def song_html(song_id, full_name, image_url, release_year):
+    """Build the inline HTML for a song; memoized since it only depends on its arguments"""
+    spotify_url = f"https://open.spotify.com/track/{song_id}"
     
-    # Create display text with year, handling missing release_year
-    release_year = song.get('release_year', 'N/A')
-    display_text = f"{song['full_name']} ({release_year})"
-    if rank is not None:
-        display_text = f"{rank}. {display_text}"
+    display_text = f"{full_name} ({release_year})"
     
-    html = f'''
+    return f'''
         <div style="display: flex; align-items: center; gap: 10px; height: 40px;">
             <a href="{spotify_url}" target="_blank" style="display: flex; align-items: center; gap: 10px; text-decoration: none; color: #191414;">
-                <img src="{song['image_url']}" style="width: 30px; height: 30px;">
+                <img src="{image_url}" style="width: 30px; height: 30px;">
                 <p style="margin: 0; font-size: 16px;">{display_text}</p>
             </a>
         </div>
     '''
+
+def display_song(song):
+    """Display song information with image inline and additional info"""
+    # Handle missing release_year
+    html = song_html(song['id'], song['full_name'], song['image_url'], song.get('release_year', 'N/A'))
     st.markdown(html, unsafe_allow_html=True)
 
 def move_to_position(songs, old_idx, new_idx):
@@ -105,264 +128,345 @@ def move_to_position(songs, old_idx, new_idx):
         return True
     return False
 
-def get_next_available_rank(ranked_songs):
-    """Find the lowest available rank that isn't taken"""
-    if not ranked_songs:
-        return 1
+def insert_by_rank(songs, song):
+    """Insert a song into a list of songs that is already sorted by rank"""
+    bisect.insort(songs, song, key=lambda x: x['rank'])
+
+def get_next_available_rank(taken):
+    """Find the lowest available rank, given the sorted distinct ranks already taken"""
+    # taken[i] > i + 1 holds from the first gap onwards, so binary search for it
+    rank = bisect.bisect_left(range(len(taken)), True, key=lambda i: taken[i] > i + 1) + 1
     
-    # Get all current ranks
-    current_ranks = {song['rank'] for song in ranked_songs}
+    return min(rank, 2000)  # Fallback to 2000 if somehow all ranks are taken
+
+def backfill_release_years(sp, songs):
+    """Fill in release_year for the given songs, one request per 50 tracks; False if any request failed"""
+    complete = True
+    ids = [song['id'] for song in songs]
+    chunks = [ids[i:i + 50] for i in range(0, len(ids), 50)]
     
-    # Find the first number from 1 to 2000 that's not in current_ranks
-    for rank in range(1, 2001):
-        if rank not in current_ranks:
-            return rank
+    # Requests are network-bound, so run the chunks on a small thread pool;
+    # spotipy itself retries rate-limited (429) requests, honouring Retry-After
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(sp.tracks, chunk) for chunk in chunks]
+        
+        for i, (chunk, future) in enumerate(zip(chunks, futures)):
+            try:
+                tracks = future.result()['tracks']
+            except:
+                tracks = [None] * len(chunk)
+                complete = False
+            for song, track in zip(songs[i * 50:(i + 1) * 50], tracks):
+                song['release_year'] = track['album']['release_date'][:4] if track else 'N/A'
     
-    return 2000  # Fallback to 2000 if somehow all ranks are taken
+    return complete
 
 def save_rankings(rankings):
     """Save rankings to a JSON file"""
-    with open('rankings.json', 'w') as f:
-        json.dump(rankings, f)
+    # Write to a temporary file first so a crash never leaves a truncated file;
+    # each save gets its own file since sessions can save concurrently
+    with tempfile.NamedTemporaryFile(dir='.', prefix='rankings.json.', suffix='.tmp', delete=False) as f:
+        f.write(orjson.dumps(rankings))
+    os.replace(f.name, 'rankings.json')
+    read_rankings.clear()  # Drop the persisted entry for the old file
+
+@st.cache_data(persist="disk", show_spinner=False)
+def read_rankings(mtime):
+    """Parse the rankings file; cached per modification time so unchanged files are never re-read"""
+    with open('rankings.json', 'rb') as f:
+        return orjson.loads(f.read())
 
-def load_rankings():
+def load_rankings(sp):
     """Load rankings from JSON file and ensure all required fields are present"""
     if os.path.exists('rankings.json'):
-        with open('rankings.json', 'r') as f:
-            rankings = json.load(f)
-            
-            # Update any existing songs that might not have release_year
-            for song in rankings:
-                if 'release_year' not in song:
-                    try:
-                        track = st.session_state.spotify.track(song['id'])
-                        song['release_year'] = track['album']['release_date'][:4]
-                    except:
-                        song['release_year'] = 'N/A'
-            
-            return rankings
+        rankings = read_rankings(os.path.getmtime('rankings.json'))
+        
+        # Update any existing songs that might not have release_year, and write
+        # them back so the lookup is not repeated; after a failed request, skip
+        # the write so the next session retries
+        missing = [song for song in rankings if 'release_year' not in song]
+        if missing and backfill_release_years(sp, missing):
+            save_rankings(rankings)
+        
+        return rankings
     return []
 
-def main():
-    # Set page config with custom background and text colors
-    st.set_page_config(page_title="Top 2000 Adinde (van Stijn weet je wel)", layout="wide")
+@st.cache_resource
+def get_custom_css():
+    """Build the static CSS block once and reuse it on every rerun"""
+    return """
+    <style>
+        /* Button styling */
+        .stButton button {
+            background-color: white !important;
+            color: #191414 !important;
+            border: none;
+            height: 38px;
+            padding: 0 16px;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            font-size: 14px;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            min-width: 0;
+        }
+        
+        /* Button hover effect */
+        .stButton button:hover {
+            background-color: #f0f0f0 !important;
+            color: #191414 !important;
+            border: none;
+        }
+        
+        /* Input fields */
+        .stNumberInput input {
+            color: #191414;
+            background-color: white;
+            height: 38px;
+            width: 80px !important;
+        }
+        
+        /* Success messages */
+        .stSuccess {
+            background-color: white;
+            color: #191414;
+        }
 
-    # Custom CSS for styling
-    st.markdown("""
-        <style>
-            /* Main background */
-            .stApp {
-                background-color: #1db954;
-            }
-            
-            /* Text color */
-            .stMarkdown, .stText, p, h1, h2, h3 {
-                color: #191414 !important;
-            }
-            
-            /* Button styling */
-            .stButton button {
-                background-color: white !important;
-                color: #191414 !important;
-                border: none;
-                height: 38px;
-                padding: 0 16px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 14px;
-                white-space: nowrap;
-                overflow: hidden;
-                text-overflow: ellipsis;
-                min-width: 0;
-            }
-            
-            /* Button hover effect */
-            .stButton button:hover {
-                background-color: #f0f0f0 !important;
-                color: #191414 !important;
-                border: none;
-            }
-            
-            /* Input fields */
-            .stNumberInput input {
-                color: #191414;
-                background-color: white;
-                height: 38px;
-                width: 80px !important;
-            }
-            
-            /* Success messages */
-            .stSuccess {
-                background-color: white;
-                color: #191414;
-            }
-
-            /* Column alignment */
-            [data-testid="column"] {
-                display: flex;
-                align-items: center;
-                gap: 1rem;
-                min-width: 0;
-            }
-
-            /* Number input container */
-            .stNumberInput {
-                display: flex;
-                align-items: center;
-                gap: 0.5rem;
-                min-width: 0;
-            }
-
-            /* Number input label */
-            .stNumberInput label {
-                margin-bottom: 0 !important;
-                font-size: 14px;
-                min-height: 0 !important;
-                white-space: nowrap;
-                overflow: hidden;
-                text-overflow: ellipsis;
-            }
-
-            /* Adjust width of number input wrapper */
-            [data-testid="stNumberInput"] {
-                width: auto !important;
-                min-width: 0;
-            }
-        </style>
-    """, unsafe_allow_html=True)
+        /* Column alignment */
+        [data-testid="column"] {
+            display: flex;
+            align-items: center;
+            gap: 1rem;
+            min-width: 0;
+        }
 
-    st.title("Top 2000 Adinde (van Stijn weet je wel)")
+        /* Number input container */
+        .stNumberInput {
+            display: flex;
+            align-items: center;
+            gap: 0.5rem;
+            min-width: 0;
+        }
 
-    # Initialize session state
-    if 'ranked_songs' not in st.session_state:
-        st.session_state.ranked_songs = load_rankings()  # Load saved rankings
-    if 'spotify' not in st.session_state:
-        try:
-            st.session_state.spotify = initialize_spotify()
-        except Exception as e:
-            st.error(f"Failed to connect to Spotify: {str(e)}")
-            return
-    if 'suggestions' not in st.session_state:
-        st.session_state.suggestions = []
+        /* Number input label */
+        .stNumberInput label {
+            margin-bottom: 0 !important;
+            font-size: 14px;
+            min-height: 0 !important;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
 
-    # Create two columns with [3, 2] ratio (60% - 40%)
-    left_col, right_col = st.columns([3, 2])
+        /* Adjust width of number input wrapper */
+        [data-testid="stNumberInput"] {
+            width: auto !important;
+            min-width: 0;
+        }
+    </style>
+    """
 
-    with left_col:
-        st.subheader(f"Your Rankings ({len(st.session_state.ranked_songs)} songs ranked)")
-        
-        if st.session_state.ranked_songs:
-            # Display songs directly without sorting functionality
-            for idx, song in enumerate(st.session_state.ranked_songs):
-                col1, col2, col3 = st.columns([4, 2, 1])
-                with col1:
-                    display_song(song, song['rank'])
-                with col2:
-                    new_rank = st.number_input(
-                        "",
-                        min_value=1,
-                        max_value=2000,
-                        value=song['rank'],
-                        key=f"rank_{song['id']}_{idx}",
-                        label_visibility="collapsed"
-                    )
-                    if new_rank != song['rank']:
-                        song['rank'] = new_rank
-                        st.session_state.ranked_songs = sorted(
-                            st.session_state.ranked_songs,
-                            key=lambda x: x['rank']
-                        )
-                        save_rankings(st.session_state.ranked_songs)
-                        st.rerun()
-                with col3:
-                    if st.button("Remove", key=f"remove_{song['id']}_{idx}"):
-                        st.session_state.ranked_songs.remove(song)
-                        save_rankings(st.session_state.ranked_songs)
-                        st.rerun()
+@st.cache_data(max_entries=1, show_spinner=False)
+def rankings_to_csv(rankings):
+    """Serialize rankings to CSV, reusing the result until the rankings change"""
+    # Songs added from suggestions carry extra fields, so use the union of all keys
+    fieldnames = list(dict.fromkeys(key for song in rankings for key in song))
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames, lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(rankings)
+    return buf.getvalue().encode()
 
-    with right_col:
-        st.subheader("Add Songs")
-        
-        # Search functionality
-        search_query = st.text_input("Search for songs")
-        if search_query:
-            search_results = search_spotify(st.session_state.spotify, search_query)
-            if search_results:
-                st.write("Search Results:")
-                for idx, song in enumerate(search_results):
-                    col1, col2, col3 = st.columns([4, 2, 1])
-                    with col1:
-                        display_song(song)
-                    with col2:
-                        next_rank = get_next_available_rank(st.session_state.ranked_songs)
-                        rank = st.number_input(
-                            "",
-                            min_value=1,
-                            max_value=2000,
-                            value=next_rank,
-                            key=f"pos_{song['id']}_{idx}",
-                            label_visibility="collapsed"
-                        )
-                    with col3:
-                        if st.button("Add", key=f"add_search_{song['id']}_{idx}"):
-                            if song not in st.session_state.ranked_songs:
-                                song['rank'] = rank
-                                st.session_state.ranked_songs.append(song)
-                                st.session_state.ranked_songs = sorted(
-                                    st.session_state.ranked_songs,
-                                    key=lambda x: x['rank']
-                                )
-                                save_rankings(st.session_state.ranked_songs)
-                                st.success(f"Song added at rank {rank}!")
-                                st.rerun()
+def apply_ranking_edits(key):
+    """Apply the rank edits and row deletions made in the rankings editor"""
+    changes = st.session_state[key]
+    
+    # Rows added in the editor have no Spotify track behind them, so drop them
+    # by giving the editor a fresh key
+    if changes['added_rows']:
+        st.session_state.rankings_editor_version += 1
+    if not changes['edited_rows'] and not changes['deleted_rows']:
+        return
+    
+    songs = st.session_state.ranked_songs
+    deleted = set(changes['deleted_rows'])
+    
+    # Resolve edited rows before deleting, since deletions shift the indices
+    edited = [
+        (songs[int(idx)], int(row['rank']))
+        for idx, row in changes['edited_rows'].items()
+        if row.get('rank') is not None and int(idx) not in deleted
+    ]
+    for idx in sorted(deleted, reverse=True):
+        st.session_state.ranked_ids.discard(songs.pop(idx)['id'])
+    for song, rank in edited:
+        songs.remove(song)
+        song['rank'] = rank
+        insert_by_rank(songs, song)
+    
+    save_rankings(songs)
+    
+    # Callbacks cannot rerun the app themselves, so let render_rankings do it
+    st.session_state.rankings_changed = True
 
-        # Suggestions section
-        st.subheader("Suggestions from your Spotify")
-        if st.button("Load Suggestions"):
-            suggestions = get_spotify_suggestions(st.session_state.spotify)
-            if suggestions:
-                st.session_state.suggestions = suggestions
-                st.success(f"Loaded {len(suggestions)} suggestions!")
-            else:
-                st.error("No suggestions found")
-            
-        if st.session_state.suggestions:
-            st.write("Your Top Songs:")
-            for idx, song in enumerate(st.session_state.suggestions):
+@st.fragment
+def render_rankings():
+    """Render the ranked songs in an editable grid"""
+    # After an edit, rerun the whole app so the rank inputs on the search and
+    # suggestion cards are rebuilt with the new next free rank
+    if st.session_state.pop('rankings_changed', False):
+        st.rerun()
+    
+    st.subheader(f"Your Rankings ({len(st.session_state.ranked_songs)} songs ranked)")
+    
+    if st.session_state.ranked_songs:
+        key = f"rankings_editor_{st.session_state.rankings_editor_version}"
+        st.data_editor(
+            st.session_state.ranked_songs,
+            column_config={
+                'rank': st.column_config.NumberColumn("Rank", min_value=1, max_value=2000, step=1, required=True),
+                'image_url': st.column_config.ImageColumn(""),
+                'full_name': st.column_config.TextColumn("Song"),
+                'release_year': st.column_config.TextColumn("Year"),
+            },
+            column_order=['rank', 'image_url', 'full_name', 'release_year'],
+            disabled=['image_url', 'full_name', 'release_year'],
+            num_rows="dynamic",
+            hide_index=True,
+            use_container_width=True,
+            key=key,
+            on_change=apply_ranking_edits,
+            args=(key,)
+        )
+
+@st.fragment
+def render_search(sp):
+    """Render the search box and its results; typing only reruns this fragment"""
+    # Lowest free rank, used as the default for every card below
+    taken = sorted({song['rank'] for song in st.session_state.ranked_songs})
+    next_rank = get_next_available_rank(taken)
+    
+    search_query = st.text_input("Search for songs")
+    if search_query:
+        search_results = search_spotify(sp, search_query)
+        if search_results:
+            st.write("Search Results:")
+            for idx, song in enumerate(search_results):
                 col1, col2, col3 = st.columns([4, 2, 1])
                 with col1:
                     display_song(song)
                 with col2:
-                    next_rank = get_next_available_rank(st.session_state.ranked_songs)
                     rank = st.number_input(
                         "",
                         min_value=1,
                         max_value=2000,
                         value=next_rank,
-                        key=f"pos_sug_{song['id']}_{idx}",
+                        key=f"pos_{song['id']}_{idx}",
                         label_visibility="collapsed"
                     )
                 with col3:
-                    if st.button("Add", key=f"add_suggestion_{song['id']}_{idx}"):
-                        if song not in st.session_state.ranked_songs:
+                    if st.button("Add", key=f"add_search_{song['id']}_{idx}"):
+                        if song['id'] not in st.session_state.ranked_ids:
                             song['rank'] = rank
-                            st.session_state.ranked_songs.append(song)
-                            st.session_state.ranked_songs = sorted(
-                                st.session_state.ranked_songs,
-                                key=lambda x: x['rank']
-                            )
+                            insert_by_rank(st.session_state.ranked_songs, song)
+                            st.session_state.ranked_ids.add(song['id'])
                             save_rankings(st.session_state.ranked_songs)
                             st.success(f"Song added at rank {rank}!")
-                            st.rerun()
+                            st.rerun()  # Full rerun so the rankings list picks up the song
+
+@st.fragment
+def render_suggestions(sp):
+    """Render the Spotify suggestions; loading them only reruns this fragment"""
+    # Lowest free rank, used as the default for every card below
+    taken = sorted({song['rank'] for song in st.session_state.ranked_songs})
+    next_rank = get_next_available_rank(taken)
+    
+    if st.button("Load Suggestions"):
+        # Errors are handled here so that failed fetches are not cached
+        try:
+            suggestions = get_spotify_suggestions(sp)
+        except Exception as e:
+            print(f"Error getting suggestions: {str(e)}")
+            suggestions = []
+        if suggestions:
+            st.session_state.suggestions = suggestions
+            st.success(f"Loaded {len(suggestions)} suggestions!")
+        else:
+            st.error("No suggestions found")
+        
+    if st.session_state.suggestions:
+        st.write("Your Top Songs:")
+        for idx, song in enumerate(st.session_state.suggestions):
+            col1, col2, col3 = st.columns([4, 2, 1])
+            with col1:
+                display_song(song)
+            with col2:
+                rank = st.number_input(
+                    "",
+                    min_value=1,
+                    max_value=2000,
+                    value=next_rank,
+                    key=f"pos_sug_{song['id']}_{idx}",
+                    label_visibility="collapsed"
+                )
+            with col3:
+                if st.button("Add", key=f"add_suggestion_{song['id']}_{idx}"):
+                    if song['id'] not in st.session_state.ranked_ids:
+                        song['rank'] = rank
+                        insert_by_rank(st.session_state.ranked_songs, song)
+                        st.session_state.ranked_ids.add(song['id'])
+                        save_rankings(st.session_state.ranked_songs)
+                        st.success(f"Song added at rank {rank}!")
+                        st.rerun()  # Full rerun so the rankings list picks up the song
+
+def main():
+    # Set page config with custom background and text colors
+    st.set_page_config(page_title="Top 2000 Adinde (van Stijn weet je wel)", layout="wide")
+
+    # Custom CSS for styling (colors live in .streamlit/config.toml)
+    st.markdown(get_custom_css(), unsafe_allow_html=True)
+
+    st.title("Top 2000 Adinde (van Stijn weet je wel)")
+
+    # Connect to Spotify (the client is shared across sessions and reruns)
+    try:
+        sp = initialize_spotify()
+    except Exception as e:
+        st.error(f"Failed to connect to Spotify: {str(e)}")
+        return
+
+    # Initialize session state
+    if 'ranked_songs' not in st.session_state:
+        st.session_state.ranked_songs = load_rankings(sp)  # Load saved rankings
+    if 'ranked_ids' not in st.session_state:
+        st.session_state.ranked_ids = {song['id'] for song in st.session_state.ranked_songs}
+    if 'suggestions' not in st.session_state:
+        st.session_state.suggestions = []
+    if 'rankings_editor_version' not in st.session_state:
+        st.session_state.rankings_editor_version = 0
+
+    # Create two columns with [3, 2] ratio (60% - 40%)
+    left_col, right_col = st.columns([3, 2])
+
+    with left_col:
+        render_rankings()
+
+    with right_col:
+        st.subheader("Add Songs")
+        render_search(sp)
+
+        # Suggestions section
+        st.subheader("Suggestions from your Spotify")
+        render_suggestions(sp)
 
     # Add export functionality
     if st.session_state.ranked_songs:
         if st.button("Export Rankings"):
-            df = pd.DataFrame(st.session_state.ranked_songs)
             st.download_button(
                 label="Download Rankings",
-                data=df.to_csv(index=False),
+                data=rankings_to_csv(st.session_state.ranked_songs),
                 file_name="my_top_2000.csv",
                 mime="text/csv"
             )